@@ -1,12 +1,21 @@
 import asyncio
-from typing import ClassVar, Dict, Type, List, Any, Optional
-from abc import ABC, abstractmethod
+import bisect
+from typing import ClassVar, Dict, Type, List, Tuple, Any, Optional, AsyncIterator
+from abc import ABC, ABCMeta, abstractmethod
 from dataclasses import dataclass, field
+from enum import IntEnum
+import sys
 import time
 
 # --- 1. Data Structure (Typed and Immutable-like) ---
 
-@dataclass(frozen=False) # frozen=False allows mutation within the pipeline
+class Status(IntEnum):
+    """Lifecycle state of a DataPacket; members are singletons, so compare with 'is'."""
+    PENDING = 0
+    FAILED = 1
+    COMPLETED = 2
+
+@dataclass(frozen=False, slots=True) # frozen=False allows mutation; slots=True drops the per-instance __dict__
 class DataPacket:
     """A structured, typed data packet that travels through the pipeline."""
     
@@ -16,29 +25,41 @@ class DataPacket:
     
     # Internal state/history fields
     current_payload: str = field(default="")
-    status: str = field(default="PENDING")
-    history: List[str] = field(default_factory=list)
+    status: Status = field(default=Status.PENDING)
+    history: List[Tuple[str, str]] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    
+    # Step logging is off by default; when off, 'history' stays empty
+    _log_enabled: ClassVar[bool] = False
 
     def log_step(self, processor_name: str, result: str):
-        """Helper to log the action taken by a processor."""
-        self.history.append(f"[{processor_name}] -> {result}")
+        """Helper to log the action taken by a processor (no-op unless logging is enabled)."""
+        if type(self)._log_enabled:
+            # Store the raw parts; formatting is deferred until the history is displayed
+            self.history.append((processor_name, result))
+
+    @staticmethod
+    def format_history(history: List[Tuple[str, str]]) -> List[str]:
+        """Formats logged (processor_name, result) steps for display."""
+        return [f"[{processor_name}] -> {result}" for processor_name, result in history]
 
     def fail(self, processor_name: str, error_msg: str):
         """Helper to mark the packet as failed."""
-        self.status = "FAILED"
+        self.status = Status.FAILED
         self.errors.append(f"[{processor_name}] ERROR: {error_msg}")
 
 
 # --- 2. Refined Metaclass for Ordered Self-Registration ---
 
-class PipelineMeta(type):
+class PipelineMeta(ABCMeta):
     """
     Metaclass that automatically registers all concrete Processor subclasses
     and stores them with a defined execution order (using the 'order' attribute).
     """
     # Registered processors, keyed by their defined order number
     _processors: ClassVar[Dict[int, Type['AbstractProcessor']]] = {}
+    # Same processors as (order, class) pairs, kept sorted as they register
+    _ordered: ClassVar[List[Tuple[int, Type['AbstractProcessor']]]] = []
 
     def __new__(mcs, name, bases, namespace):
         cls = super().__new__(mcs, name, bases, namespace)
@@ -55,6 +76,8 @@ class PipelineMeta(type):
                  raise ValueError(f"Order '{order}' already registered by {PipelineMeta._processors[order].__name__}. Order must be unique.")
                  
             PipelineMeta._processors[order] = cls
+            # Orders are unique, so the tuple comparison never falls through to the class
+            bisect.insort(PipelineMeta._ordered, (order, cls))
             print(f"💡 Registered Processor: {name} (Order: {order})")
                 
         return cls
@@ -62,8 +85,8 @@ class PipelineMeta(type):
     @staticmethod
     def get_ordered_processors() -> List[Type['AbstractProcessor']]:
         """Returns the list of concrete processor classes sorted by their 'order'."""
-        # This dynamic sorting ensures the pipeline always runs in the correct sequence
-        return [PipelineMeta._processors[k] for k in sorted(PipelineMeta._processors.keys())]
+        # Sorted once at registration time, so building a Pipeline does no sorting
+        return [cls for _, cls in PipelineMeta._ordered]
 
 # --- 3. Abstract Processor with Strict Contract ---
 
@@ -104,7 +127,7 @@ class TransformationProcessor(AbstractProcessor):
     order = 20
 
     async def process(self, packet: DataPacket) -> DataPacket:
-        if packet.status == "FAILED":
+        if packet.status is Status.FAILED:
             return packet # Skip if failed in previous step
             
         await asyncio.sleep(0.3) # Simulate a heavier transformation
@@ -119,7 +142,7 @@ class PersistenceProcessor(AbstractProcessor):
     order = 30
 
     async def process(self, packet: DataPacket) -> DataPacket:
-        if packet.status == "FAILED":
+        if packet.status is Status.FAILED:
             return packet # Skip if failed
             
         await asyncio.sleep(0.5) # Simulate database I/O
@@ -127,7 +150,7 @@ class PersistenceProcessor(AbstractProcessor):
         # In a real system, you'd write packet.current_payload to a database
         print(f"💾 Persistence: Wrote ID {packet.data_id} successfully.")
         
-        packet.status = "COMPLETED"
+        packet.status = Status.COMPLETED
         packet.log_step(self.__class__.__name__, "Result persisted to storage.")
         
         return packet
@@ -143,31 +166,45 @@ class Pipeline:
     
     def __init__(self):
         self._processors = PipelineMeta.get_ordered_processors()
+        # Processors are stateless, so one shared instance per class is enough
+        self._instances = [ProcessorClass() for ProcessorClass in self._processors]
         print(f"\n✨ Pipeline Initialized with {len(self._processors)} steps.")
 
     async def run(self, packet: DataPacket) -> DataPacket:
         """
-        Executes the processor chain sequentially, passing the DataPacket
-        from one step's output to the next step's input.
+        Executes the processor chain sequentially for a single DataPacket,
+        passing one step's output to the next step's input.
         """
         current_packet = packet
         
         print(f"--- Starting DataPacket ID {current_packet.data_id} ---")
 
-        for ProcessorClass in self._processors:
+        for processor_instance in self._instances:
             # Check if the packet has failed and stop chaining
-            if current_packet.status == "FAILED":
-                print(f"🚨 Stopping chain for ID {current_packet.data_id} after {ProcessorClass.__name__}")
+            if current_packet.status is Status.FAILED:
+                print(f"🚨 Stopping chain for ID {current_packet.data_id} after {type(processor_instance).__name__}")
                 break
             
-            processor_instance = ProcessorClass() # Create instance per run (or use a pool/singleton)
-            
             # The key improvement: input is the previous output
             current_packet = await processor_instance.process(current_packet)
             
-        print(f"--- Finished DataPacket ID {current_packet.data_id} ({current_packet.status}) ---\n")
+        print(f"--- Finished DataPacket ID {current_packet.data_id} ({current_packet.status.name}) ---\n")
         return current_packet
 
+    async def stream(self, packets: List[DataPacket]) -> AsyncIterator[DataPacket]:
+        """
+        Runs many DataPackets through the chain concurrently, one task per
+        packet, and yields each packet as soon as its chain has finished.
+        Any exception raised by a processor propagates to the caller.
+        """
+        tasks = [asyncio.create_task(self.run(packet)) for packet in packets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel() # No-op for finished tasks; stops the rest on error or early exit
+
 # --- 6. Main Execution Loop ---
 
 async def main():
@@ -188,30 +225,50 @@ async def main():
     
     start_time = time.time()
     
-    # 4. Create tasks to run multiple packets concurrently
-    tasks = [pipeline.run(p) for p in data_packets]
-    
-    # Run all pipelines concurrently (asyncio.gather is the true concurrency tool)
-    finished_packets = await asyncio.gather(*tasks)
+    # 4. Run all packets through the pipeline concurrently (one task per packet)
+    # and record each one in the report columns as soon as it completes,
+    # instead of waiting for the slowest packet before touching any result
+    # (column layout: one pre-sized list per reported field)
+    count = len(data_packets)
+    ids, statuses, errs, payloads, histories = ([None] * count for _ in range(5))
+    i = 0
+    async for packet in pipeline.stream(data_packets):
+        ids[i] = packet.data_id
+        statuses[i] = packet.status
+        errs[i] = packet.errors
+        payloads[i] = packet.current_payload
+        histories[i] = packet.history
+        i += 1
     
     end_time = time.time()
     
     # 5. Review Results
     print("\n\n=============== FINAL REPORT ===============")
-    for packet in finished_packets:
-        print(f"ID {packet.data_id} | Status: {packet.status}")
-        if packet.errors:
-            print(f"  Errors: {packet.errors}")
-        if packet.status == "COMPLETED":
-            print(f"  Final Payload (first 30 chars): {packet.current_payload[:30]}...")
-        print(f"  History: {packet.history}")
+    for i in range(count):
+        print(f"ID {ids[i]} | Status: {statuses[i].name}")
+        if errs[i]:
+            print(f"  Errors: {errs[i]}")
+        if statuses[i] is Status.COMPLETED:
+            print(f"  Final Payload (first 30 chars): {payloads[i][:30]}...")
+        if DataPacket._log_enabled:
+            print(f"  History: {DataPacket.format_history(histories[i])}")
         print("---------------------------------------------")
 
     print(f"\n--- Total execution time: {end_time - start_time:.2f} seconds ---")
 
 
 if __name__ == "__main__":
+    # Enable per-step history logging on demand (e.g., python Pipeline.py debug)
+    DataPacket._log_enabled = len(sys.argv) > 1 and sys.argv[1].lower() == 'debug'
+    
+    try:
+        # Optional: uvloop's libuv-based event loop has lower per-callback overhead
+        import uvloop
+        run = getattr(uvloop, "run", asyncio.run) # uvloop.run() exists since uvloop 0.18
+    except ImportError:
+        run = asyncio.run
+    
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("Program interrupted.")
\ No newline at end of file
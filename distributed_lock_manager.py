@@ -1,6 +1,7 @@
 # distributed_lock_manager.py
 
 import redis
+import sys
 import time
 import uuid
 import threading
@@ -12,8 +13,127 @@ REDIS_HOST = 'localhost'
 REDIS_PORT = 6379
 LOCK_TIMEOUT_SECONDS = 5 # Maximum time a lock can be held
 LOCK_KEY = "global_resource_lock"
+RELEASE_WAIT_SECONDS = 1 # Re-check interval in case a lock expires without a release message
+RELEASE_CHANNEL_PREFIX = "distributed_lock:released:" # Release channel of a lock is this prefix + its key
 
-# --- 1. The Distributed Lock Context Manager ---
+# Shared connection pool: every lock reuses pooled TCP connections instead of
+# opening (and handshaking) a fresh connection per DistributedLock instance.
+# When all connections are busy, callers wait for one instead of failing.
+_POOL = redis.BlockingConnectionPool(
+    host=REDIS_HOST, port=REDIS_PORT, max_connections=64, decode_responses=True
+)
+
+# Atomic check-and-delete that also wakes up waiters on the lock's release channel (ARGV[2])
+RELEASE_LUA_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    local deleted = redis.call("del", KEYS[1])
+    redis.call("publish", ARGV[2], 1)
+    return deleted
+else
+    return 0
+end
+"""
+
+# One client and one pre-registered release script shared by all locks;
+# the script is invoked via EVALSHA, so only its SHA1 goes over the wire
+_CLIENT = redis.Redis(connection_pool=_POOL)
+_RELEASE = _CLIENT.register_script(RELEASE_LUA_SCRIPT)
+
+# --- 1. Release Notifications ---
+
+class _ChannelWaiters:
+    """Wait state for one release channel; only exists while someone waits on it."""
+    __slots__ = ("condition", "waiters", "releases")
+
+    def __init__(self, lock: threading.Lock):
+        self.condition = threading.Condition(lock) # All channels share the listener's lock
+        self.waiters = 0
+        self.releases = 0 # Release messages seen since the first waiter arrived
+
+
+class ReleaseListener:
+    """
+    A single pub/sub subscriber shared by every waiting lock in this process.
+    A background thread listens on this module's release channels and bumps a
+    per-channel release counter; waiters block on a local Condition instead of
+    each holding its own Redis connection for the whole wait.
+    """
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self._lock = threading.Lock()
+        self._channels = {} # channel -> _ChannelWaiters, only for channels with waiters
+        self._start_lock = threading.Lock() # Serialises (re)starts; never held by _on_release
+        self._pubsub = None
+        self._thread = None
+
+    def _ensure_started(self):
+        """Starts (or restarts, after a connection loss) the subscriber thread."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._pubsub is not None:
+                self._pubsub.close() # Hand the dead connection back to the pool
+                self._pubsub = None
+            
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(**{RELEASE_CHANNEL_PREFIX + "*": self._on_release})
+            except redis.exceptions.RedisError:
+                pubsub.close()
+                raise
+            self._pubsub = pubsub
+            self._thread = pubsub.run_in_thread(
+                sleep_time=RELEASE_WAIT_SECONDS, daemon=True,
+                exception_handler=self._on_thread_error
+            )
+
+    @staticmethod
+    def _on_thread_error(error: Exception, pubsub, thread):
+        # Stop the worker; its run loop then closes the pubsub connection. The next
+        # waiter restarts the listener, and waiters meanwhile fall back to re-checking.
+        print(f"⚠️ Release listener stopped: {error}")
+        thread.stop()
+
+    def _on_release(self, message: dict):
+        with self._lock:
+            state = self._channels.get(message["channel"])
+            if state is None:
+                return # Nobody in this process waits on this lock
+            state.releases += 1
+            state.condition.notify_all()
+
+    def add_waiter(self, channel: str):
+        """Registers interest in 'channel'; call remove_waiter() when done waiting."""
+        self._ensure_started()
+        with self._lock:
+            state = self._channels.get(channel)
+            if state is None:
+                state = self._channels[channel] = _ChannelWaiters(self._lock)
+            state.waiters += 1
+
+    def remove_waiter(self, channel: str):
+        """Drops interest in 'channel', forgetting its state once nobody waits on it."""
+        with self._lock:
+            state = self._channels[channel]
+            state.waiters -= 1
+            if state.waiters == 0:
+                del self._channels[channel]
+
+    def releases_seen(self, channel: str) -> int:
+        """Returns the release counter of 'channel'; read it BEFORE trying to acquire."""
+        with self._lock:
+            return self._channels[channel].releases
+
+    def wait(self, channel: str, seen: int, timeout: float):
+        """Blocks until 'channel' has a release newer than 'seen', or 'timeout' passes."""
+        with self._lock:
+            state = self._channels[channel]
+            state.condition.wait_for(lambda: state.releases != seen, timeout)
+
+
+_LISTENER = ReleaseListener(_CLIENT)
+
+# --- 2. The Distributed Lock Context Manager ---
 
 class DistributedLock:
     """
@@ -23,26 +143,41 @@ class DistributedLock:
     def __init__(self, key: str, timeout: int = LOCK_TIMEOUT_SECONDS):
         self.key = key
         self.timeout = timeout
-        self.lock_id = str(uuid.uuid4()) # Unique identifier for the lock owner
-        self.client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+        self.lock_id = uuid.uuid4().hex # Unique identifier for the lock owner
+        self.release_channel = RELEASE_CHANNEL_PREFIX + key
+        self.client = _CLIENT
         self.acquired = False
 
     def __enter__(self):
-        """Acquire the lock (blocking wait)."""
+        """Acquire the lock (blocking wait until woken by a release)."""
         start_time = time.time()
+        deadline = start_time + self.timeout * 2 # Max wait time is double the lock timeout
         
-        while time.time() - start_time < self.timeout * 2: # Max wait time is double the lock timeout
-            # Try to acquire the lock: 
-            # NX: Only set if the key does NOT EXIST
-            # EX: Set an expiration time (for safety against crashes)
-            # This is an atomic operation (SET ... NX EX)
-            if self.client.set(self.key, self.lock_id, ex=self.timeout, nx=True):
-                self.acquired = True
-                print(f"✅ Thread {threading.get_ident()} ACQUIRED lock: {self.lock_id}")
-                return self
-            
-            # Lock is held by someone else, wait a bit
-            time.sleep(0.1) 
+        _LISTENER.add_waiter(self.release_channel)
+        try:
+            while True:
+                # Read the release counter BEFORE the attempt, so a release that happens
+                # between a failed SET and the wait below cannot be missed
+                seen = _LISTENER.releases_seen(self.release_channel)
+                
+                # Try to acquire the lock: 
+                # NX: Only set if the key does NOT EXIST
+                # EX: Set an expiration time (for safety against crashes)
+                # This is an atomic operation (SET ... NX EX)
+                if self.client.set(self.key, self.lock_id, ex=self.timeout, nx=True):
+                    self.acquired = True
+                    print(f"✅ Thread {threading.get_ident()} ACQUIRED lock: {self.lock_id}")
+                    return self
+                
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                
+                # Lock is held by someone else: block until the holder publishes a
+                # release (or the re-check interval passes)
+                _LISTENER.wait(self.release_channel, seen, min(remaining, RELEASE_WAIT_SECONDS))
+        finally:
+            _LISTENER.remove_waiter(self.release_channel)
 
         raise TimeoutError(f"❌ Failed to acquire lock {self.key} after blocking wait.")
 
@@ -52,17 +187,10 @@ class DistributedLock:
             # Use a Lua script for atomic check-and-delete:
             # This prevents a race condition where the lock could expire, 
             # be acquired by another thread, and then deleted by THIS thread.
+            # The same script publishes the release so waiters wake up immediately.
             
-            lua_script = """
-            if redis.call("get", KEYS[1]) == ARGV[1] then
-                return redis.call("del", KEYS[1])
-            else
-                return 0
-            end
-            """
-            
-            # Execute the script atomically
-            result = self.client.eval(lua_script, 1, self.key, self.lock_id)
+            # Execute the script atomically (EVALSHA, falling back to EVAL on first use)
+            result = _RELEASE(keys=[self.key], args=[self.lock_id, self.release_channel])
             
             if result:
                 print(f"🗑️ Thread {threading.get_ident()} RELEASED lock: {self.lock_id}")
@@ -72,7 +200,7 @@ class DistributedLock:
         
         self.acquired = False
 
-# --- 2. Simulated Resource Access ---
+# --- 3. Simulated Resource Access ---
 
 # A shared, critical resource (e.g., a database counter)
 SHARED_COUNTER = 0
@@ -106,14 +234,13 @@ def critical_section_worker(worker_id: int):
         print("FATAL: Redis connection failed. Please ensure Redis server is running.")
         return
 
-# --- 3. Execution (Simulating Multi-threaded/Multi-process Access) ---
+# --- 4. Execution (Simulating Multi-threaded/Multi-process Access) ---
 
 if __name__ == "__main__":
     
     # 1. Clean up old locks
     try:
-        r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
-        r.delete(LOCK_KEY)
+        _CLIENT.delete(LOCK_KEY)
         print(f"🧹 Cleaned up old lock key: {LOCK_KEY}")
     except redis.exceptions.ConnectionError:
         print("FATAL: Cannot connect to Redis. Please start the Redis server.")
@@ -1,20 +1,27 @@
-from typing import Optional
 from typing import Iterable, Callable, Iterator, Any
+import array
 import itertools
 import time
 
+try:
+    from numba import njit
+except ImportError: # Numba is optional; without it the kernel below runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
 # --- 1. Utility Functions (Higher-Order Functions) ---
 
 def apply_pipeline(data_stream: Iterable[Any], *functions: Callable) -> Iterator[Any]:
     """
     A higher-order function that chains multiple transformation functions.
-    It returns a generator, enabling lazy evaluation.
+    It returns a single fused generator, enabling lazy evaluation: each item
+    passes through every function in turn without nesting one generator per step.
     """
-    current_stream = data_stream
-    for func in functions:
-        # Apply the function to the current stream, creating a new generator
-        current_stream = (func(item) for item in current_stream)
-    return current_stream
+    functions = tuple(functions)
+    for item in data_stream:
+        for func in functions:
+            item = func(item)
+        yield item
 
 # --- 2. Generator Functions (Lazy Data Source) ---
 
@@ -27,9 +34,9 @@ def infinite_source(start: int = 0) -> Iterator[int]:
         
 # --- 3. Transformation Functions (Pure Functions) ---
 
-def filter_odd(x: int) -> Optional[int]:
-    """Pure function: Filters out odd numbers."""
-    return x if x % 2 == 0 else None
+def is_even(x: int) -> bool:
+    """Pure predicate: True for even numbers (used to filter out odd ones)."""
+    return x % 2 == 0
 
 def map_square(x: int) -> int:
     """Pure function: Squares the input."""
@@ -50,20 +57,21 @@ def run_lazy_pipeline(limit: int):
     # This is also lazy; it doesn't execute until the final 'for' loop requests an item.
     limited_stream = itertools.islice(source_stream, limit)
 
-    # 3. Define the Processing Chain (Using the Higher-Order Function)
+    # 3. Define the Filter Stage (Drops odd items instead of mapping them to a placeholder)
+    even_stream = filter(is_even, limited_stream)
+
+    # 4. Define the Processing Chain (Using the Higher-Order Function)
     # All these operations are chained without executing a single step yet.
     # The output is a generator.
     pipeline_generator = apply_pipeline(
-        limited_stream,
-        filter_odd,    # Removes odd numbers (returns None for them)
-        lambda x: x if x is not None else -1, # Intermediate cleanup of filtered items
+        even_stream,
         map_square,    # Squares the remaining even numbers
         map_format     # Formats the final result
     )
     
     print(f"✨ Pipeline created. No data processed yet (limit={limit}).")
 
-    # 4. Final Consumption (The loop forces the entire lazy pipeline to execute)
+    # 5. Final Consumption (The loop forces the entire lazy pipeline to execute)
     processed_count = 0
     start_time = time.time()
     
@@ -85,6 +93,47 @@ def run_lazy_pipeline(limit: int):
     print(f"Execution time: {end_time - start_time:.4f} seconds")
     print("The pipeline only calculated the first 10 items, demonstrating lazy efficiency.")
 
+# --- 5. Compiled Fast Path (Fused Kernel) ---
+
+@njit(cache=True)
+def process_range(start: int, limit: int, out) -> int:
+    """
+    Fused kernel for the numeric part of the pipeline: keeps the even numbers
+    in [start, start + limit), squares them and writes them into 'out'.
+    Stops as soon as 'out' is full, so only the consumed window is computed.
+    Returns the number of results written.
+    """
+    count = 0
+    for x in range(start, start + limit):
+        if count == len(out):
+            break
+        if x % 2 == 0:
+            out[count] = x * x
+            count += 1
+    return count
+
+def run_compiled_pipeline(limit: int, window: int = 10):
+    
+    # Preallocated int64 buffer sized to what the consumer will actually display
+    out = array.array("q", [0]) * window
+    
+    # Warm-up call on an empty range: triggers Numba's compilation (or cache load)
+    # so that the timed region below only measures the kernel itself
+    process_range(0, 0, out)
+    
+    start_time = time.time()
+    count = process_range(0, limit, out)
+    
+    # Only the consumed prefix is formatted into strings
+    results = [map_format(x) for x in out[:count]]
+    end_time = time.time()
+    
+    print("\n--- Compiled Kernel Results ---")
+    for item in results:
+        print(f"Computed Item: {item}")
+    print(f"Execution time: {end_time - start_time:.4f} seconds")
+
 if __name__ == "__main__":
     # Simulate processing a large stream of 10,000 items
-    run_lazy_pipeline(limit=10000)
\ No newline at end of file
+    run_lazy_pipeline(limit=10000)
+    run_compiled_pipeline(limit=10000)
\ No newline at end of file
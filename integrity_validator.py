@@ -1,25 +1,24 @@
 # integrity_validator.py
 
+import asyncio
+import hashlib
 import os
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+import shutil
+from functools import lru_cache
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.backends import default_backend
-from typing import Tuple, Optional
+from typing import Iterable, List, Tuple, Optional
 
 # --- 1. Key Management and Persistence ---
 
-def generate_keys() -> Tuple[rsa.RSAPrivateNumbers, rsa.RSAPublicNumbers]:
-    """Generates a new RSA private and public key pair."""
-    # Generate a secure 2048-bit RSA key pair
-    private_key = rsa.generate_private_key(
-        public_exponent=65537,
-        key_size=2048,
-        backend=default_backend()
-    )
+def generate_keys() -> Tuple[ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey]:
+    """Generates a new Ed25519 private and public key pair."""
+    # Ed25519 keys are fixed-size, so there is no key size or exponent to choose
+    private_key = ed25519.Ed25519PrivateKey.generate()
     return private_key, private_key.public_key()
 
-def save_private_key(private_key: rsa.RSAPrivateKey, filename: str = "private.pem"):
+def save_private_key(private_key: ed25519.Ed25519PrivateKey, filename: str = "private.pem"):
     """Saves the private key securely (requires a password)."""
     password = b"strong-security-password" 
     
@@ -33,8 +32,13 @@ def save_private_key(private_key: rsa.RSAPrivateKey, filename: str = "private.pe
         f.write(pem)
     print(f"🔑 Private key saved to {filename} (Encrypted).")
 
-def load_private_key(filename: str = "private.pem") -> rsa.RSAPrivateKey:
-    """Loads the private key, requiring the password."""
+def load_private_key(filename: str = "private.pem") -> ed25519.Ed25519PrivateKey:
+    """Loads the private key, requiring the password (cached until the file changes)."""
+    return _load_private_key_cached(filename, os.path.getmtime(filename))
+
+@lru_cache(maxsize=32)
+def _load_private_key_cached(filename: str, mtime: float) -> ed25519.Ed25519PrivateKey:
+    # 'mtime' is only part of the cache key: rewriting the file invalidates the entry
     password = b"strong-security-password"
     with open(filename, "rb") as f:
         pem = f.read()
@@ -46,7 +50,7 @@ def load_private_key(filename: str = "private.pem") -> rsa.RSAPrivateKey:
     )
     return private_key
 
-def save_public_key(public_key: rsa.RSAPublicKey, filename: str = "public.pem"):
+def save_public_key(public_key: ed25519.Ed25519PublicKey, filename: str = "public.pem"):
     """Saves the public key (unencrypted)."""
     pem = public_key.public_bytes(
         encoding=serialization.Encoding.PEM,
@@ -56,8 +60,13 @@ def save_public_key(public_key: rsa.RSAPublicKey, filename: str = "public.pem"):
         f.write(pem)
     print(f"🗝️ Public key saved to {filename}.")
 
-def load_public_key(filename: str = "public.pem") -> rsa.RSAPublicKey:
-    """Loads the public key."""
+def load_public_key(filename: str = "public.pem") -> ed25519.Ed25519PublicKey:
+    """Loads the public key (cached until the file changes)."""
+    return _load_public_key_cached(filename, os.path.getmtime(filename))
+
+@lru_cache(maxsize=32)
+def _load_public_key_cached(filename: str, mtime: float) -> ed25519.Ed25519PublicKey:
+    # 'mtime' is only part of the cache key: rewriting the file invalidates the entry
     with open(filename, "rb") as f:
         pem = f.read()
     public_key = serialization.load_pem_public_key(
@@ -68,44 +77,77 @@ def load_public_key(filename: str = "public.pem") -> rsa.RSAPublicKey:
 
 # --- 2. Signing and Verification Logic ---
 
-def sign_data(data: bytes, private_key: rsa.RSAPrivateKey) -> bytes:
+def hash_data(data: bytes) -> bytes:
+    """Computes the SHA256 digest that gets signed/verified in place of the raw data."""
+    return hashlib.sha256(data).digest()
+
+def hash_file(filename: str) -> bytes:
     """
-    Creates a digital signature of the data using the private key.
-    This process first hashes the data (SHA256) and then encrypts the hash.
+    Computes the SHA256 digest of a file by streaming it in blocks,
+    without reading the whole file into memory first.
     """
-    # Use PKCS1 v1.5 padding and SHA256 for a secure signature
-    signature = private_key.sign(
-        data,
-        padding.PSS(
-            mgf=padding.MGF1(hashes.SHA256()),
-            salt_length=padding.PSS.MAX_LENGTH
-        ),
-        hashes.SHA256()
-    )
+    with open(filename, "rb") as f:
+        if hasattr(hashlib, "file_digest"): # Python 3.11+
+            return hashlib.file_digest(f, "sha256").digest()
+        
+        hasher = hashlib.sha256()
+        buffer = bytearray(64 * 1024)
+        view = memoryview(buffer)
+        while size := f.readinto(buffer):
+            hasher.update(view[:size])
+        return hasher.digest()
+
+def sign_digest(digest: bytes, private_key: ed25519.Ed25519PrivateKey) -> bytes:
+    """Signs an already computed SHA256 digest using the private key."""
+    # Ed25519 takes no padding or hash parameters; the 32-byte digest is the
+    # signed message and the resulting signature is always 64 bytes
+    signature = private_key.sign(digest)
     print(f"✍️ Data signed successfully.")
     return signature
 
-def verify_signature(data: bytes, signature: bytes, public_key: rsa.RSAPublicKey) -> bool:
+def sign_data(data: bytes, private_key: ed25519.Ed25519PrivateKey) -> bytes:
     """
-    Verifies the digital signature using the public key.
-    If the file has been tampered with or the signature is invalid, verification fails.
+    Creates a digital signature of the data using the private key.
+    This process first hashes the data (SHA256) and then signs the hash.
     """
+    return sign_digest(hash_data(data), private_key)
+
+def sign_file(filename: str, private_key: ed25519.Ed25519PrivateKey) -> bytes:
+    """Same as sign_data, but hashes the file as a stream instead of in one read."""
+    return sign_digest(hash_file(filename), private_key)
+
+def verify_digest(digest: bytes, signature: bytes, public_key: ed25519.Ed25519PublicKey) -> bool:
+    """Verifies the digital signature of an already computed SHA256 digest."""
     try:
         # This function will raise an exception if the signature is invalid
-        public_key.verify(
-            signature,
-            data,
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
-        )
+        public_key.verify(signature, digest)
         return True
     except Exception as e:
         print(f"Verification FAILED. Reason: {e}")
         return False
 
+def verify_signature(data: bytes, signature: bytes, public_key: ed25519.Ed25519PublicKey) -> bool:
+    """
+    Verifies the digital signature using the public key.
+    If the file has been tampered with or the signature is invalid, verification fails.
+    """
+    return verify_digest(hash_data(data), signature, public_key)
+
+def verify_file(filename: str, signature: bytes, public_key: ed25519.Ed25519PublicKey) -> bool:
+    """Same as verify_signature, but hashes the file as a stream instead of in one read."""
+    return verify_digest(hash_file(filename), signature, public_key)
+
+async def verify_files(files: Iterable[Tuple[str, bytes]], public_key: ed25519.Ed25519PublicKey) -> List[bool]:
+    """
+    Verifies a batch of (filename, signature) pairs concurrently on worker threads.
+    hashlib releases the GIL while hashing large buffers and the cryptography
+    backend releases it while verifying, so the batch spreads across multiple cores.
+    """
+    return await asyncio.gather(*(
+        asyncio.to_thread(verify_file, filename, signature, public_key)
+        for filename, signature in files
+    ))
+
 # --- 3. File Utility ---
 
 def create_test_file(filename: str, content: str):
@@ -120,16 +162,12 @@ def tamper_with_file(filename: str):
         f.write("\n\n[INJECTED MALICIOUS CODE HERE]")
     print(f"🚨 Tampered with file: {filename}")
 
-def read_file_as_bytes(filename: str) -> bytes:
-    """Reads file content for hashing and signing."""
-    with open(filename, "rb") as f:
-        return f.read()
-
 # --- Main Execution ---
 
 async def main():
     
     FILE_NAME = "important_document.txt"
+    TAMPERED_FILE_NAME = "important_document_tampered.txt"
     SIG_FILE = "document.sig"
     
     # 1. Setup: Generate and save keys
@@ -140,28 +178,37 @@ async def main():
     # 2. Create the Original Document
     original_content = "This is the secure original data. Hash: A8B9C0D1"
     create_test_file(FILE_NAME, original_content)
-    original_data = read_file_as_bytes(FILE_NAME)
 
     # 3. Signing Process (Done by the sender/author)
     print("\n--- Signing the Original File ---")
-    signature = sign_data(original_data, private_key)
+    # Run the crypto on a worker thread so the event loop is not blocked
+    signature = await asyncio.to_thread(sign_file, FILE_NAME, private_key)
     
     # Save the signature to a file
     with open(SIG_FILE, "wb") as f:
         f.write(signature)
     print(f"📝 Signature saved to {SIG_FILE}")
 
-    # --- Scenario 1: Successful Verification (Integrity Intact) ---
-    
-    # 4. Verification Process (Done by the receiver)
-    print("\n--- SCENARIO 1: Verification of Intact File ---")
-    
+    # 4. Prepare a Tampered Copy (Simulated attack on a second delivery of the document)
+    # The copy carries the same signature but is modified AFTER it was signed
+    shutil.copyfile(FILE_NAME, TAMPERED_FILE_NAME)
+    tamper_with_file(TAMPERED_FILE_NAME)
+
+    # 5. Verification Process (Done by the receiver)
     # Load the public key to verify (Public keys are safe to share)
-    public_key_loaded = load_public_key()
-    data_to_verify = read_file_as_bytes(FILE_NAME)
+    public_key_loaded = await asyncio.to_thread(load_public_key)
     signature_to_verify = signature # Use the signature we just created
     
-    if verify_signature(data_to_verify, signature_to_verify, public_key_loaded):
+    # Verify both files as one concurrent batch
+    intact, tampered = await verify_files(
+        [(FILE_NAME, signature_to_verify), (TAMPERED_FILE_NAME, signature_to_verify)],
+        public_key_loaded
+    )
+
+    # --- Scenario 1: Successful Verification (Integrity Intact) ---
+    
+    print("\n--- SCENARIO 1: Verification of Intact File ---")
+    if intact:
         print("✅ SUCCESS: The file's integrity is verified. It is authentic and untampered.")
     else:
         print("❌ FAILURE: Verification failed.")
@@ -169,26 +216,18 @@ async def main():
     # --- Scenario 2: Failed Verification (File Tampered) ---
     
     print("\n--- SCENARIO 2: Verification of Tampered File ---")
-    
-    # Simulate an attack: modify the file AFTER it was signed
-    tamper_with_file(FILE_NAME)
-    
-    # Try to verify the tampered file using the original signature
-    tampered_data = read_file_as_bytes(FILE_NAME)
-    
-    if verify_signature(tampered_data, signature_to_verify, public_key_loaded):
+    if tampered:
         print("❌ CRITICAL FAILURE: Verification succeeded despite tampering!")
     else:
         print("✅ SUCCESS (Defensive): Verification failed due to tampering. Data integrity loss detected.")
     
     # Cleanup keys and file
     os.remove(FILE_NAME)
+    os.remove(TAMPERED_FILE_NAME)
     os.remove(SIG_FILE)
     os.remove("private.pem")
     os.remove("public.pem")
     print("\n🧹 Cleaned up temporary files.")
 
 if __name__ == "__main__":
-    # Note: No asyncio used here, but keeping the main structure similar for consistency
-    import asyncio
     asyncio.run(main())
\ No newline at end of file